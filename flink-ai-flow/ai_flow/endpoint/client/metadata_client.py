@@ -17,11 +17,10 @@
 # under the License.
 #
 from ai_flow.api.context_extractor import ContextExtractor, BroadcastAllContextExtractor
-from ai_flow.meta.workflow_meta import WorkflowMeta
+from ai_flow.meta.workflow_meta import WorkflowMeta, serialize_context_extractor
 from typing import Optional, Text, List
 
 import grpc
-import cloudpickle
 from ai_flow.common.status import Status
 from ai_flow.meta.artifact_meta import ArtifactMeta
 from ai_flow.meta.dataset_meta import DatasetMeta, Properties, DataType
@@ -702,7 +701,7 @@ class MetadataClient(BaseClient):
         workflow_request = WorkflowMetaProto(name=name,
                                              project_id=int64Value(project_id),
                                              properties=properties,
-                                             context_extractor_in_bytes=cloudpickle.dumps(context_extractor),
+                                             context_extractor_in_bytes=serialize_context_extractor(context_extractor),
                                              graph=stringValue(graph))
         request = metadata_service_pb2.RegisterWorkflowRequest(workflow=workflow_request)
         response = self.metadata_store_stub.registerWorkflow(request)
@@ -779,7 +778,7 @@ class MetadataClient(BaseClient):
         """
         request = metadata_service_pb2.UpdateWorkflowRequest(workflow_name=workflow_name,
                                                              project_name=project_name,
-                                                             context_extractor_in_bytes=cloudpickle.dumps(
+                                                             context_extractor_in_bytes=serialize_context_extractor(
                                                                  context_extractor),
                                                              properties=properties,
                                                              graph=stringValue(graph))
@@ -16,19 +16,74 @@
 # specific language governing permissions and limitations
 # under the License.
 #
+import pickle
+import zlib
+from collections import defaultdict
+from operator import attrgetter
+
 import cloudpickle
 
-from ai_flow.api.context_extractor import ContextExtractor
+from ai_flow.api.context_extractor import ContextExtractor, BroadcastAllContextExtractor
 
 from ai_flow.util.json_utils import Jsonable
-from typing import Text, List
+from typing import Any, Dict, Text, List
 from ai_flow.common.properties import Properties
 from ai_flow.workflow.control_edge import WorkflowSchedulingRule, WorkflowAction, EventCondition
 
+# The maximum length of the graph printed by WorkflowMeta.__str__.
+MAX_GRAPH_STR_LENGTH = 128
+
+# Returned by WorkflowMeta.get_condition for actions without conditions, it must not be modified.
+_EMPTY_CONDITIONS: List[EventCondition] = []
+
+# Stored as context_extractor_in_bytes in place of pickling the default BroadcastAllContextExtractor.
+_BROADCAST_ALL_CONTEXT_EXTRACTOR_BYTES = b'\x00DEFAULT'
+_BROADCAST_ALL_CONTEXT_EXTRACTOR = BroadcastAllContextExtractor()
+
+_RULE_ACTION_AND_CONDITION = attrgetter('action', 'event_condition')
+
+# The prefix of the zlib compressed context_extractor_in_bytes, bytes without it are plain cloudpickle output.
+_COMPRESSED_CONTEXT_EXTRACTOR_MAGIC = b'AFZ\x01'
+
+
+def serialize_context_extractor(context_extractor: ContextExtractor) -> bytes:
+    """
+    Serialize the ContextExtractor instance to the context_extractor_in_bytes of a workflow.
+    The pickled instance is compressed with zlib unless that does not make it smaller, the default
+    BroadcastAllContextExtractor is not pickled. So the bytes must be read with
+    deserialize_context_extractor instead of cloudpickle.loads.
+
+    :param context_extractor: ContextExtractor instance
+    """
+    if type(context_extractor) is BroadcastAllContextExtractor:
+        return _BROADCAST_ALL_CONTEXT_EXTRACTOR_BYTES
+    pickled = cloudpickle.dumps(context_extractor, protocol=pickle.HIGHEST_PROTOCOL)
+    compressed = _COMPRESSED_CONTEXT_EXTRACTOR_MAGIC + zlib.compress(pickled, 1)
+    return compressed if len(compressed) < len(pickled) else pickled
+
+
+def deserialize_context_extractor(context_extractor_in_bytes: bytes) -> ContextExtractor:
+    """
+    Deserialize the context_extractor_in_bytes written by serialize_context_extractor,
+    plain cloudpickle output is also accepted.
+
+    :param context_extractor_in_bytes: the serialized context extractor in bytes
+    """
+    if context_extractor_in_bytes == _BROADCAST_ALL_CONTEXT_EXTRACTOR_BYTES:
+        return _BROADCAST_ALL_CONTEXT_EXTRACTOR
+    if context_extractor_in_bytes.startswith(_COMPRESSED_CONTEXT_EXTRACTOR_MAGIC):
+        context_extractor_in_bytes = zlib.decompress(
+            context_extractor_in_bytes[len(_COMPRESSED_CONTEXT_EXTRACTOR_MAGIC):])
+    return cloudpickle.loads(context_extractor_in_bytes)
+
 
 class WorkflowMeta(Jsonable):
     """define workflow meta"""
 
+    __slots__ = ('name', 'project_id', 'properties', 'create_time', 'update_time', 'uuid',
+                 'context_extractor_in_bytes', 'graph', '_scheduling_rules', '_rules_by_action',
+                 '_context_extractor_cache')
+
     def __init__(self,
                  name: Text,
                  project_id: int,
@@ -61,54 +116,93 @@ class WorkflowMeta(Jsonable):
         self.uuid = uuid
         self.context_extractor_in_bytes = context_extractor_in_bytes
         self.graph = graph
-        self.scheduling_rules = [] if scheduling_rules is None else scheduling_rules
+        self.scheduling_rules = scheduling_rules
+        # (context_extractor_in_bytes, ContextExtractor) pair of the last decoded extractor.
+        self._context_extractor_cache = None
+
+    def to_json_dict(self) -> Dict[Text, Any]:
+        return {'name': self.name,
+                'project_id': self.project_id,
+                'properties': self.properties,
+                'create_time': self.create_time,
+                'update_time': self.update_time,
+                'uuid': self.uuid,
+                'context_extractor_in_bytes': self.context_extractor_in_bytes,
+                'graph': self.graph,
+                'scheduling_rules': self.scheduling_rules}
+
+    @classmethod
+    def from_json_dict(cls, dict_data: Dict[Text, Any]) -> 'WorkflowMeta':
+        return cls(**dict_data)
+
+    @property
+    def scheduling_rules(self) -> List[WorkflowSchedulingRule]:
+        return self._scheduling_rules
+
+    @scheduling_rules.setter
+    def scheduling_rules(self, scheduling_rules: List[WorkflowSchedulingRule]):
+        self._scheduling_rules = [] if scheduling_rules is None else scheduling_rules
+        self._rebuild_index()
+
+    def _rebuild_index(self):
+        rules_by_action: Dict[WorkflowAction, List[EventCondition]] = defaultdict(list)
+        for action, event_condition in map(_RULE_ACTION_AND_CONDITION, self._scheduling_rules):
+            rules_by_action[action].append(event_condition)
+        self._rules_by_action = dict(rules_by_action)
 
     def get_condition(self, action: WorkflowAction) -> List[EventCondition]:
-        if self.scheduling_rules is None:
-            return []
-        return [rule.event_condition for rule in self.scheduling_rules if rule.action == action]
+        """
+        Return the event conditions of the given action, the returned list should not be modified.
+        """
+        return self._rules_by_action.get(action, _EMPTY_CONDITIONS)
 
     def update_condition(self, event_conditions: List[EventCondition], action: WorkflowAction):
-        scheduling_rules = self.scheduling_rules if self.scheduling_rules is not None else []
-        new_scheduling_rules = [rule for rule in scheduling_rules if rule.action != action]
-        new_scheduling_rules.extend(
-            [WorkflowSchedulingRule(condition, action) for condition in event_conditions])
+        new_scheduling_rules = [rule for rule in self._scheduling_rules if rule.action != action]
+        if not event_conditions and len(new_scheduling_rules) == len(self._scheduling_rules):
+            return
+        new_scheduling_rules.extend(WorkflowSchedulingRule(condition, action) for condition in event_conditions)
         self.scheduling_rules = new_scheduling_rules
 
     def __str__(self):
+        context_extractor_len = len(self.context_extractor_in_bytes) if self.context_extractor_in_bytes else 0
+        graph = self.graph
+        if graph is not None and len(graph) > MAX_GRAPH_STR_LENGTH:
+            graph = graph[:MAX_GRAPH_STR_LENGTH] + '...'
         return '<\n' \
                'WorkflowMeta\n' \
-               'uuid:{},\n' \
-               'name:{},\n' \
-               'project_id:{},\n' \
-               'properties:{},\n' \
-               'create_time:{},\n' \
-               'update_time:{},\n' \
-               'context_extractor_in_bytes:{},\n' \
-               'graph:{},\n' \
-               '>'.format(self.uuid,
-                          self.name,
-                          self.project_id,
-                          self.properties,
-                          self.create_time,
-                          self.update_time,
-                          self.context_extractor_in_bytes,
-                          self.graph)
+               f'uuid:{self.uuid},\n' \
+               f'name:{self.name},\n' \
+               f'project_id:{self.project_id},\n' \
+               f'properties:{self.properties},\n' \
+               f'create_time:{self.create_time},\n' \
+               f'update_time:{self.update_time},\n' \
+               f'context_extractor_in_bytes:len={context_extractor_len},\n' \
+               f'graph:{graph},\n' \
+               '>'
 
     def get_context_extractor(self) -> ContextExtractor:
         """
         Return the deserialized ContextExtractor instance.
+        The instance is cached until context_extractor_in_bytes changes.
 
         """
-        return cloudpickle.loads(self.context_extractor_in_bytes)
+        cache = self._context_extractor_cache
+        if cache is not None and cache[0] is self.context_extractor_in_bytes:
+            return cache[1]
+        context_extractor = deserialize_context_extractor(self.context_extractor_in_bytes)
+        self._context_extractor_cache = (self.context_extractor_in_bytes, context_extractor)
+        return context_extractor
 
     def set_context_extractor(self, context_extractor: ContextExtractor):
         """
-        Set the context_extractor_in_bytes from given ContextExtractor instance.
+        Set the context_extractor_in_bytes from given ContextExtractor instance with
+        serialize_context_extractor. So the context_extractor_in_bytes must be read with
+        get_context_extractor instead of cloudpickle.loads.
 
         :param context_extractor: ContextExtractor instance
         """
-        self.context_extractor_in_bytes = cloudpickle.dumps(context_extractor)
+        self.context_extractor_in_bytes = serialize_context_extractor(context_extractor)
+        self._context_extractor_cache = (self.context_extractor_in_bytes, context_extractor)
 
 
 def create_workflow(name: Text,
@@ -18,7 +18,6 @@
 #
 from abc import abstractmethod, ABCMeta
 
-import cloudpickle
 from ai_flow.api.context_extractor import BroadcastAllContextExtractor
 
 from ai_flow.meta.artifact_meta import ArtifactMeta
@@ -26,9 +25,10 @@ from ai_flow.endpoint.server.high_availability import Member
 from typing import Text, Union, List, Optional
 
 from ai_flow.meta.metric_meta import MetricMeta, MetricSummary
+from ai_flow.meta.workflow_meta import serialize_context_extractor
 from ai_flow.scheduler_service.service.workflow_execution_event_handler_state import WorkflowContextEventHandlerState
 
-BROADCAST_ALL_CONTEXT_EXTRACTOR = cloudpickle.dumps(BroadcastAllContextExtractor())
+BROADCAST_ALL_CONTEXT_EXTRACTOR = serialize_context_extractor(BroadcastAllContextExtractor())
 
 
 class AbstractStore(object):
@@ -25,8 +25,9 @@ from unittest import TestCase
 import cloudpickle
 
 from ai_flow.project.project_config import ProjectConfig
-from notification_service.base_notification import EventWatcher
+from notification_service.base_notification import EventWatcher, BaseEvent
 
+from ai_flow.api.context_extractor import BroadcastAllContextExtractor
 from ai_flow.common.properties import Properties
 from ai_flow.common.status import Status
 from ai_flow.meta.dataset_meta import DatasetMeta, DataType, Schema
@@ -38,6 +39,7 @@ from ai_flow.client.ai_flow_client import AIFlowClient
 from ai_flow.endpoint.server.exception import AIFlowException
 from ai_flow.endpoint.server.server import AIFlowServer
 from ai_flow.store.db.base_model import base
+from ai_flow.test.store.common import TestContextExtractor
 from ai_flow.test.store.test_sqlalchemy_store import _get_store
 
 _SQLITE_DB_FILE = 'aiflow.db'
@@ -240,6 +242,28 @@ class AIFlowClientTestCases(object):
         self.assertEqual(graph, response_by_id.graph)
         self.assertEqual(graph, response_by_name.graph)
 
+    def test_register_and_update_workflow_with_context_extractor(self):
+        project_response = client.register_project(name='project', uri='www.code.com')
+        response = client.register_workflow(name='workflow_with_default', project_id=project_response.uuid)
+        self.assertLess(len(response.context_extractor_in_bytes),
+                        len(cloudpickle.dumps(BroadcastAllContextExtractor())))
+        self.assertIsInstance(response.get_context_extractor(), BroadcastAllContextExtractor)
+
+        response = client.register_workflow(name='workflow', project_id=project_response.uuid,
+                                            context_extractor=TestContextExtractor())
+        workflow = client.get_workflow_by_name(project_response.name, 'workflow')
+        self.assertEqual(response.context_extractor_in_bytes, workflow.context_extractor_in_bytes)
+        self.assertLessEqual(len(workflow.context_extractor_in_bytes),
+                        len(cloudpickle.dumps(TestContextExtractor())))
+        context_extractor = workflow.get_context_extractor()
+        self.assertIsInstance(context_extractor, TestContextExtractor)
+        self.assertIn('hello', context_extractor.extract_context(BaseEvent(key='1', value='1')).get_contexts())
+
+        client.update_workflow(workflow_name='workflow', project_name=project_response.name,
+                               context_extractor=BroadcastAllContextExtractor())
+        workflow = client.get_workflow_by_name(project_response.name, 'workflow')
+        self.assertIsInstance(workflow.get_context_extractor(), BroadcastAllContextExtractor)
+
     def test_double_register_workflow(self):
         project_response = client.register_project(name='project', uri='www.code.com')
         project_response2 = client.register_project(name='project2', uri='www.code.com')
@@ -278,7 +302,7 @@ class AIFlowClientTestCases(object):
         graph = '{"__af_object_type__":"jsonable","__class__":"AIGraph","__module__":"ai_flow.ai_graph.ai_graph","edges":{"AINode_0":[{"__af_object_type__":"jsonable","__class__":"DataEdge","__module__":"ai_flow.ai_graph.data_edge","destination":"AINode_0","port":0,"source":"ReadDatasetNode_0"}],"WriteDatasetNode_0":[{"__af_object_type__":"jsonable","__class__":"DataEdge","__module__":"ai_flow.ai_graph.data_edge","destination":"WriteDatasetNode_0","port":0,"source":"AINode_0"}]},"name":null,"node_id":"AIGraph_0","nodes":{"AINode_0":{"__af_object_type__":"jsonable","__class__":"AINode","__module__":"ai_flow.ai_graph.ai_node","config":{"__af_object_type__":"jsonable","__class__":"JobConfig","__module__":"ai_flow.workflow.job_config","job_name":"data_processing","job_type":"python","properties":{}},"name":null,"node_config":{"name":null,"node_type":"transform","properties":null},"node_id":"AINode_0","output_num":1,"processor":{"__af_object_type__":"bytes","__class__":"bytes","__data__":"\u0080\u0003c__main__\nDataProcessingProcessor\nq\u0000)\u0081q\u0001.","__module__":"builtins"},"properties":{}},"ReadDatasetNode_0":{"__af_object_type__":"jsonable","__class__":"ReadDatasetNode","__module__":"ai_flow.ai_graph.ai_node","config":{"__af_object_type__":"jsonable","__class__":"JobConfig","__module__":"ai_flow.workflow.job_config","job_name":"data_processing","job_type":"python","properties":{}},"name":null,"node_config":{"dataset":{"__af_object_type__":"jsonable","__class__":"DatasetMeta","__module__":"ai_flow.meta.dataset_meta","catalog_connection_uri":null,"catalog_database":null,"catalog_name":null,"catalog_table":null,"catalog_type":null,"create_time":1629894260861,"data_format":null,"description":null,"name":"daily_data","properties":null,"schema":{"__af_object_type__":"jsonable","__class__":"Schema","__module__":"ai_flow.meta.dataset_meta","name_list":null,"type_list":null},"update_time":1629894260861,"uri":"/tmp/daily_data","uuid":3},"name":null,"node_type":"read_dataset","properties":null},"node_id":"ReadDatasetNode_0","output_num":1,"processor":{"__af_object_type__":"bytes","__class__":"bytes","__data__":"\u0080\u0003c__main__\nDataProcessingReader\nq\u0000)\u0081q\u0001.","__module__":"builtins"},"properties":{}},"WriteDatasetNode_0":{"__af_object_type__":"jsonable","__class__":"WriteDatasetNode","__module__":"ai_flow.ai_graph.ai_node","config":{"__af_object_type__":"jsonable","__class__":"JobConfig","__module__":"ai_flow.workflow.job_config","job_name":"data_processing","job_type":"python","properties":{}},"name":null,"node_config":{"dataset":{"__af_object_type__":"jsonable","__class__":"DatasetMeta","__module__":"ai_flow.meta.dataset_meta","catalog_connection_uri":null,"catalog_database":null,"catalog_name":null,"catalog_table":null,"catalog_type":null,"create_time":1629894260868,"data_format":null,"description":null,"name":"daily_data_result","properties":null,"schema":{"__af_object_type__":"jsonable","__class__":"Schema","__module__":"ai_flow.meta.dataset_meta","name_list":null,"type_list":null},"update_time":1629894260868,"uri":"/tmp/daily_result","uuid":4},"name":null,"node_type":"write_dataset","properties":null},"node_id":"WriteDatasetNode_0","output_num":0,"processor":{"__af_object_type__":"bytes","__class__":"bytes","__data__":"\u0080\u0003c__main__\nDataProcessingWriter\nq\u0000)\u0081q\u0001.","__module__":"builtins"},"properties":{}}},"output_num":0,"properties":{}}'
         updated_workflow = client.update_workflow(project_name=project_response.name,
                                                   workflow_name='workflow',
-                                                  context_extractor=cloudpickle.loads(response.context_extractor_in_bytes),
+                                                  context_extractor=response.get_context_extractor(),
                                                   properties=Properties({'a': 'c'}),
                                                   graph=graph)
         self.assertEqual(updated_workflow.properties, Properties({'a': 'c'}))
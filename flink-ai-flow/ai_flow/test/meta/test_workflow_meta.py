@@ -18,11 +18,24 @@
 #
 import unittest
 
-from ai_flow.workflow.control_edge import MeetAllEventCondition, WorkflowAction
+import cloudpickle
+
+from ai_flow.api.context_extractor import BroadcastAllContextExtractor, ContextExtractor, ContextList, \
+    EventContext
+from ai_flow.util import json_utils
+from ai_flow.workflow.control_edge import MeetAllEventCondition, WorkflowAction, WorkflowSchedulingRule
 
 from ai_flow.meta.workflow_meta import WorkflowMeta
 
 
+class KeyContextExtractor(ContextExtractor):
+
+    def extract_context(self, event) -> EventContext:
+        context_list = ContextList()
+        context_list.add_context(event.key)
+        return context_list
+
+
 class TestWorkflowMeta(unittest.TestCase):
 
     def test_workflow_meta_update_condition(self):
@@ -44,3 +57,67 @@ class TestWorkflowMeta(unittest.TestCase):
 
         meta.update_condition([], WorkflowAction.START)
         self.assertListEqual([], meta.get_condition(WorkflowAction.START))
+
+        meta.scheduling_rules = [WorkflowSchedulingRule(start_condition_list[0], WorkflowAction.START)]
+        self.assertListEqual(start_condition_list[:1], meta.get_condition(WorkflowAction.START))
+        self.assertListEqual([], meta.get_condition(WorkflowAction.STOP))
+
+    def test_workflow_meta_context_extractor(self):
+        meta = WorkflowMeta('workflow', 0,
+                            context_extractor_in_bytes=cloudpickle.dumps(BroadcastAllContextExtractor()))
+        context_extractor = meta.get_context_extractor()
+        self.assertIsInstance(context_extractor, BroadcastAllContextExtractor)
+        self.assertIs(context_extractor, meta.get_context_extractor())
+
+        new_context_extractor = BroadcastAllContextExtractor()
+        meta.set_context_extractor(new_context_extractor)
+        self.assertIs(new_context_extractor, meta.get_context_extractor())
+
+        meta.context_extractor_in_bytes = cloudpickle.dumps(BroadcastAllContextExtractor())
+        self.assertIsNot(new_context_extractor, meta.get_context_extractor())
+
+    def test_workflow_meta_compressed_context_extractor(self):
+        context_extractor = KeyContextExtractor()
+        context_extractor.keys = ['key'] * 1000
+        meta = WorkflowMeta('workflow', 0)
+        meta.set_context_extractor(context_extractor)
+        loaded_meta = WorkflowMeta('workflow', 0, context_extractor_in_bytes=meta.context_extractor_in_bytes)
+        self.assertLess(len(loaded_meta.context_extractor_in_bytes), len(cloudpickle.dumps(context_extractor)))
+        self.assertEqual(context_extractor.keys, loaded_meta.get_context_extractor().keys)
+
+    def test_workflow_meta_small_context_extractor_is_not_compressed(self):
+        meta = WorkflowMeta('workflow', 0)
+        meta.set_context_extractor(KeyContextExtractor())
+        loaded_meta = WorkflowMeta('workflow', 0, context_extractor_in_bytes=meta.context_extractor_in_bytes)
+        self.assertIsInstance(cloudpickle.loads(loaded_meta.context_extractor_in_bytes), KeyContextExtractor)
+        self.assertIsInstance(loaded_meta.get_context_extractor(), KeyContextExtractor)
+
+    def test_workflow_meta_default_context_extractor(self):
+        meta = WorkflowMeta('workflow', 0)
+        meta.set_context_extractor(BroadcastAllContextExtractor())
+        loaded_meta = WorkflowMeta('workflow', 0, context_extractor_in_bytes=meta.context_extractor_in_bytes)
+        self.assertLess(len(loaded_meta.context_extractor_in_bytes), 16)
+        self.assertIsInstance(loaded_meta.get_context_extractor(), BroadcastAllContextExtractor)
+
+    def test_workflow_meta_json(self):
+        meta = WorkflowMeta('workflow', 0, properties={'a': 'b'}, uuid=1,
+                            context_extractor_in_bytes=cloudpickle.dumps(BroadcastAllContextExtractor()))
+        meta.update_condition([MeetAllEventCondition().add_event(event_key='k1', event_value='start')],
+                              WorkflowAction.START)
+        meta.get_context_extractor()
+        self.assertFalse(hasattr(meta, '__dict__'))
+
+        loaded_meta = json_utils.loads(json_utils.dumps(meta))
+        self.assertEqual(meta.name, loaded_meta.name)
+        self.assertEqual(meta.properties, loaded_meta.properties)
+        self.assertEqual(meta.uuid, loaded_meta.uuid)
+        self.assertEqual(meta.context_extractor_in_bytes, loaded_meta.context_extractor_in_bytes)
+        self.assertEqual(1, len(loaded_meta.get_condition(WorkflowAction.START)))
+        self.assertIsInstance(loaded_meta.get_context_extractor(), BroadcastAllContextExtractor)
+
+    def test_workflow_meta_str(self):
+        meta = WorkflowMeta('workflow', 0, context_extractor_in_bytes=b'\x00' * 1000, graph='g' * 1000)
+        meta_str = str(meta)
+        self.assertIn('context_extractor_in_bytes:len=1000,', meta_str)
+        self.assertIn('graph:{}...,'.format('g' * 128), meta_str)
+        self.assertNotIn('g' * 129, meta_str)
@@ -24,7 +24,7 @@ from unittest import mock
 import cloudpickle
 from notification_service.base_notification import BaseEvent
 
-from ai_flow.api.context_extractor import EventContext, ContextExtractor
+from ai_flow.api.context_extractor import EventContext, ContextExtractor, BroadcastAllContextExtractor
 from ai_flow.workflow.control_edge import MeetAllEventCondition, WorkflowSchedulingRule, \
     WorkflowAction
 
@@ -204,6 +204,14 @@ class AbstractTestStore(object):
         self.assertRaises(AIFlowException, self.store.register_workflow, name='workflow',
                           project_id=project_response.uuid)
 
+    def test_get_workflow_with_default_context_extractor(self):
+        project_response = self.store.register_project(name='project', uri='www.code.com')
+        self.store.register_workflow(name='workflow', project_id=project_response.uuid)
+        workflow = self.store.get_workflow_by_name(project_response.name, 'workflow')
+        self.assertLess(len(workflow.context_extractor_in_bytes),
+                        len(cloudpickle.dumps(BroadcastAllContextExtractor())))
+        self.assertIsInstance(workflow.get_context_extractor(), BroadcastAllContextExtractor)
+
     def test_get_workflow_with_custom_context_extractor(self):
         project_response = self.store.register_project(name='project', uri='www.code.com')
         self.assertEqual(project_response.uuid, 1)
@@ -0,0 +1,85 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import json
+import unittest
+
+from ai_flow.util import json_utils
+from ai_flow.workflow.job_config import JobConfig
+from ai_flow_plugins.job_plugins.bash.bash_job_config import BashJobConfig
+from ai_flow_plugins.job_plugins.python.python_job_config import PythonJobConfig
+
+
+class UnslottedJobConfig(JobConfig):
+
+    def __init__(self, job_name=None, properties=None):
+        super().__init__(job_name, 'unslotted', properties)
+        self.extra = 'extra'
+
+
+class TestJobConfig(unittest.TestCase):
+
+    def test_job_config_json_round_trip(self):
+        job_config = JobConfig(job_name='job', job_type='bash', properties={'a': 'b'})
+        loaded = json_utils.loads(json_utils.dumps(job_config))
+        self.assertEqual('job', loaded.job_name)
+        self.assertEqual('bash', loaded.job_type)
+        self.assertEqual({'a': 'b'}, loaded.properties)
+        self.assertFalse(hasattr(loaded, '__dict__'))
+
+    def test_bash_job_config_json_round_trip(self):
+        job_config = BashJobConfig(job_name='job', properties={'env': {'a': 'b'}})
+        self.assertEqual({'a': 'b'}, job_config.env)
+        json_text = json_utils.dumps(job_config)
+        self.assertNotIn('_env', json.loads(json_text))
+        loaded = json_utils.loads(json_text)
+        self.assertEqual('job', loaded.job_name)
+        self.assertEqual({'a': 'b'}, loaded.env)
+
+    def test_bash_job_config_env_is_derived_from_properties(self):
+        dict_data = json.loads(json_utils.dumps(BashJobConfig(job_name='job', properties={'env': {'a': 'b'}})))
+        dict_data['properties']['env'] = {'a': 'c'}
+        loaded = json_utils.loads(json.dumps(dict_data))
+        self.assertEqual({'a': 'c'}, loaded.env)
+
+        del dict_data['properties']['env']
+        loaded = json_utils.loads(json.dumps(dict_data))
+        self.assertIsNone(loaded.env)
+
+    def test_unslotted_job_config_json_round_trip(self):
+        job_config = UnslottedJobConfig(job_name='job', properties={'a': 'b'})
+        loaded = json_utils.loads(json_utils.dumps(job_config))
+        self.assertEqual('job', loaded.job_name)
+        self.assertEqual('unslotted', loaded.job_type)
+        self.assertEqual({'a': 'b'}, loaded.properties)
+        self.assertEqual('extra', loaded.extra)
+
+        job_config = PythonJobConfig(job_name='job', properties={'env': {'a': 'b'}})
+        loaded = json_utils.loads(json_utils.dumps(job_config))
+        self.assertEqual('python', loaded.job_type)
+        self.assertEqual({'a': 'b'}, loaded.env)
+
+    def test_from_json_dict_does_not_change_given_dict(self):
+        dict_data = {'job_name': 'job', 'job_type': 'unslotted', 'properties': {}, 'extra': 'extra'}
+        loaded = UnslottedJobConfig.from_json_dict(dict_data)
+        self.assertEqual('job', loaded.job_name)
+        self.assertEqual('extra', loaded.extra)
+        self.assertEqual({'job_name': 'job', 'job_type': 'unslotted', 'properties': {}, 'extra': 'extra'},
+                         dict_data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -23,10 +23,11 @@ from __future__ import division
 from __future__ import print_function
 
 import abc
+import functools
 import importlib
 import inspect
 import json
-from typing import Any, Dict, List, Text, Type, Union
+from typing import Any, Dict, List, Text, Tuple, Type, Union
 import logging
 from six import with_metaclass
 
@@ -65,24 +66,49 @@ class _ObjectType(object):
     SET = 'set'
 
 
+@functools.lru_cache(maxsize=None)
+def _slot_names(cls: Type) -> Tuple[Text, ...]:
+    """Return the names of the attributes declared in `__slots__` by the class and its bases."""
+    names = []
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        names.extend(name for name in slots if name not in ('__dict__', '__weakref__'))
+    return tuple(names)
+
+
 class Jsonable(with_metaclass(abc.ABCMeta, object)):
     """Base class for serializing and deserializing objects to/from JSON.
 
     The default implementation assumes that the subclass can be restored by
-    updating `self.__dict__` without invoking `self.__init__` function.. If the
-    subclass cannot hold the assumption, it should
+    updating `self.__dict__` and the attributes declared in `__slots__` without
+    invoking `self.__init__` function.. If the subclass cannot hold the assumption, it should
     override `to_json_dict` and `from_json_dict` to customize the implementation.
     """
 
+    __slots__ = ()
+
     def to_json_dict(self) -> Dict[Text, Any]:
         """Convert from an object to a JSON serializable dictionary."""
-        return self.__dict__
+        slot_names = _slot_names(type(self))
+        if not slot_names:
+            return self.__dict__
+        dict_data = {name: getattr(self, name) for name in slot_names if hasattr(self, name)}
+        dict_data.update(getattr(self, '__dict__', {}))
+        return dict_data
 
     @classmethod
     def from_json_dict(cls, dict_data: Dict[Text, Any]) -> Any:
         """Convert from dictionary data to an object."""
         instance = cls.__new__(cls)
-        instance.__dict__ = dict_data
+        dict_data = dict(dict_data)
+        slot_names = _slot_names(cls)
+        for name in slot_names:
+            if name in dict_data:
+                setattr(instance, name, dict_data.pop(name))
+        if dict_data or not slot_names:
+            instance.__dict__ = dict_data
         return instance
 
 
@@ -26,6 +26,8 @@ class JobConfig(Jsonable):
     JobConfig is the configuration information of the Job(ai_flow.workflow.job.Job).
     """
 
+    __slots__ = ('job_name', 'job_type', 'properties')
+
     def __init__(self,
                  job_name: Text = None,
                  job_type: Text = None,
@@ -32,10 +32,23 @@ class BashJobConfig(JobConfig):
                     a: a
                     b: b
     """
+
+    # Caches the env resolved from the properties, it is not serialized.
+    __slots__ = ('_env',)
+
     def __init__(self, job_name: Text = None,
                  properties: Dict[Text, Jsonable] = None) -> None:
         super().__init__(job_name, 'bash', properties)
 
     @property
     def env(self):
-        return self.properties.get('env')
+        try:
+            return self._env
+        except AttributeError:
+            self._env = self.properties.get('env')
+            return self._env
+
+    def to_json_dict(self) -> Dict[Text, Jsonable]:
+        dict_data = super().to_json_dict()
+        dict_data.pop('_env', None)
+        return dict_data
@@ -1,6 +1,5 @@
 from typing import Text, Set
 
-import cloudpickle
 from notification_service.base_notification import BaseEvent
 
 from ai_flow.api.context_extractor import ContextExtractor, EventContext
@@ -48,7 +47,7 @@ def main():
     af.workflow_operation.start_new_workflow_execution(workflow_name)
 
     t = af.get_ai_flow_client().get_workflow_by_name('demo', workflow_name)
-    cc = cloudpickle.loads(t.context_extractor_in_bytes)
+    cc = t.get_context_extractor()
     print(cc.extract_context(BaseEvent(key='1', value='1')).get_contexts())
 
 
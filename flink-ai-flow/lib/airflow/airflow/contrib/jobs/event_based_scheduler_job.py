@@ -665,6 +665,9 @@ class EventBasedSchedulerJob(BaseJob):
         except Exception as e:  # pylint: disable=broad-except
             self.log.exception("Exception when executing scheduler, %s", e)
         finally:
+            # Also reached on SystemExit raised by the signal handler, the pending messages
+            # are saved before the daemon flusher thread dies with the interpreter.
+            self.mailbox.close()
             self.log.info("Exited execute loop")
 
     def _run_scheduler_loop(self) -> None:
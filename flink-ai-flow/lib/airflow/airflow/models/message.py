@@ -16,6 +16,8 @@
 # specific language governing permissions and limitations
 # under the License.
 import pickle
+import weakref
+
 import dill
 from sqlalchemy import Column, Index, Integer, String, PickleType
 from sqlalchemy.orm import Session
@@ -26,18 +28,67 @@ from airflow.utils.session import provide_session
 from airflow.utils.sqlalchemy import UtcDateTime
 
 
+# Types that the stdlib pickler can not pickle, e.g. local classes, their instances are serialized
+# with dill directly. Types of objects that failed only because of their contents, e.g. an event
+# holding a lambda, are not kept here so their other instances still use the stdlib pickler.
+_DILL_PICKLED_TYPES = weakref.WeakKeyDictionary()
+
+
+def _is_type_picklable(obj_type) -> bool:
+    # Builtin types like function can not be pickled themselves, whether their instances can depends
+    # on each instance.
+    if obj_type.__module__ == 'builtins':
+        return True
+    try:
+        pickle.dumps(obj_type, protocol=pickle.HIGHEST_PROTOCOL)
+        return True
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return False
+
+
+def serialize_message(obj) -> bytes:
+    """
+    Serialize a message with the C implemented stdlib pickler, falling back to dill for
+    objects that pickle can not handle, e.g. lambdas or local classes.
+    """
+    obj_type = type(obj)
+    if obj_type in _DILL_PICKLED_TYPES:
+        return dill.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    try:
+        return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        data = dill.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        if not _is_type_picklable(obj_type):
+            _DILL_PICKLED_TYPES[obj_type] = True
+        return data
+
+
 class MessageState:
     QUEUED = "queued"
     COMPLETED = "complete"
 
 
 class IdentifiedMessage(object):
-    def __init__(self, serialized_message, msg_id):
+    __slots__ = ('serialized_message', 'msg_id', '_decoded', '_decode_error')
+
+    def __init__(self, serialized_message, msg_id, deserialized_message=None):
         self.serialized_message = serialized_message
         self.msg_id = msg_id
+        # The message object the bytes were produced from, if it is still in this process.
+        self._decoded = deserialized_message
+        # The error of a failed deserialize, raised again instead of decoding the bytes twice.
+        self._decode_error = None
 
     def deserialize(self):
-        return pickle.loads(self.serialized_message)
+        if self._decoded is None:
+            if self._decode_error is not None:
+                raise self._decode_error
+            try:
+                self._decoded = pickle.loads(self.serialized_message)
+            except Exception as e:
+                self._decode_error = e
+                raise
+        return self._decoded
 
     @provide_session
     def remove_handled_message(self, session):
@@ -64,9 +115,9 @@ class Message(Base):
         Index('ti_state', state)
     )
 
-    def __init__(self, obj):
+    def __init__(self, obj, data: bytes = None):
         self.message_type = self.get_message_type(obj)
-        self.data = pickle.dumps(obj)
+        self.data = serialize_message(obj) if data is None else data
 
     @property
     def serialized_data(self):
@@ -14,61 +14,206 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
-import pickle
 import queue
+import threading
+from typing import Dict, List, Tuple
 
 from notification_service.base_notification import BaseEvent
 
 from airflow.models.event_progress import EventProgress
 from airflow.utils import timezone
 from airflow.utils.session import provide_session
-from airflow.models.message import Message, IdentifiedMessage, MessageState
+from airflow.models.message import Message, IdentifiedMessage, MessageState, serialize_message
 from airflow.utils.log.logging_mixin import LoggingMixin
 
+# The maximum number of pending messages saved to db in one transaction.
+MAX_FLUSH_BATCH_SIZE = 128
+
+# The seconds Mailbox.close() waits for the flusher to save the pending messages.
+FLUSHER_CLOSE_TIMEOUT = 60
+
+# Put on the pending queue by Mailbox.close() to stop the flusher.
+_CLOSE_FLUSHER = object()
+
+# Put on the undecoded queue by Mailbox.close() to stop the prefetcher.
+_CLOSE_PREFETCHER = object()
+
 
 class Mailbox(LoggingMixin):
 
     def __init__(self) -> None:
         super().__init__()
-        self.queue = queue.Queue()
+        self.queue = queue.SimpleQueue()
         self.scheduling_job_id = None
+        # Messages waiting to be serialized and saved to db by the flusher, each item is a
+        # (message, scheduling_job_id) tuple.
+        self._pending = queue.SimpleQueue()
+        # Number of messages sent but not taken out yet, length() reads it without locking the queue.
+        self._length = 0
+        self._length_lock = threading.Lock()
+        # Identified messages sent without the decoded message, they are deserialized before they are
+        # put into the mailbox queue.
+        self._undecoded = queue.SimpleQueue()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._flusher = threading.Thread(target=self._flush_loop, name='MailboxFlusher', daemon=True)
+        self._flusher.start()
+        self._prefetcher = threading.Thread(target=self._prefetch_loop, name='MailboxPrefetcher', daemon=True)
+        self._prefetcher.start()
+
+    def _next_batch(self) -> Tuple[List[Tuple[object, bytes, int]], bool]:
+        """Return the next batch of serialized pending messages and whether the mailbox is closed."""
+        pending = []
+        closed = False
+        item = self._pending.get()
+        while True:
+            if item is _CLOSE_FLUSHER:
+                closed = True
+                break
+            pending.append(item)
+            if len(pending) >= MAX_FLUSH_BATCH_SIZE:
+                break
+            try:
+                item = self._pending.get_nowait()
+            except queue.Empty:
+                break
+        batch = []
+        for message, scheduling_job_id in pending:
+            try:
+                batch.append((message, serialize_message(message), scheduling_job_id))
+            except Exception as e:
+                self.log.exception("Failed to serialize message %s, %s", message, e)
+                self._add_length(-1)
+        return batch, closed
+
+    def _flush_loop(self):
+        closed = False
+        while not closed:
+            batch, closed = self._next_batch()
+            if batch:
+                self._flush(batch)
+
+    def _flush(self, batch: List[Tuple[object, bytes, int]]):
+        try:
+            identified_messages = self._save_messages_to_db(batch)
+        except Exception as e:
+            self.log.warning("Failed to save %s messages to db in one transaction, "
+                             "saving them one by one, %s", len(batch), e)
+            identified_messages = []
+            for item in batch:
+                try:
+                    identified_messages.extend(self._save_messages_to_db([item]))
+                except Exception as e:
+                    self.log.exception("Failed to save message %s to db, %s", item[0], e)
+                    self._add_length(-1)
+        # The saved messages keep the decoded message, so they skip the prefetcher.
+        for identified_message in identified_messages:
+            self.queue.put(identified_message)
+
+    def _prefetch_loop(self):
+        """Deserialize messages ahead of the consumer, IdentifiedMessage keeps the decoded message."""
+        while True:
+            identified_message: IdentifiedMessage = self._undecoded.get()
+            if identified_message is _CLOSE_PREFETCHER:
+                break
+            try:
+                identified_message.deserialize()
+            except Exception as e:
+                # The failure is kept on the message and reported by the consumer.
+                self.log.debug("Failed to prefetch message %s, %s", identified_message.msg_id, e)
+            self.queue.put(identified_message)
+
+    def _add_length(self, delta: int):
+        with self._length_lock:
+            self._length += delta
 
     @provide_session
-    def _save_message_to_db(self, message, session) -> IdentifiedMessage:
-        """ 1. save message to db
-            2. update the event progress
+    def _save_messages_to_db(self, batch: List[Tuple[object, bytes, int]],
+                             session=None) -> List[IdentifiedMessage]:
+        """ 1. save the batch of messages to db
+            2. update the event progress of each scheduling job with its latest event of the batch
         """
         try:
-            if isinstance(message, BaseEvent) and message.version is not None and message.create_time is not None:
-                progress = EventProgress(scheduling_job_id=self.scheduling_job_id,
-                                         last_event_time=message.create_time,
-                                         last_event_version=message.version)
+            latest_progress: Dict[int, EventProgress] = {}
+            message_objs = []
+            for message, data, scheduling_job_id in batch:
+                if isinstance(message, BaseEvent) and message.version is not None \
+                        and message.create_time is not None:
+                    progress = latest_progress.get(scheduling_job_id)
+                    if progress is None or (progress.last_event_time, progress.last_event_version) \
+                            <= (message.create_time, message.version):
+                        latest_progress[scheduling_job_id] = EventProgress(
+                            scheduling_job_id=scheduling_job_id,
+                            last_event_time=message.create_time,
+                            last_event_version=message.version)
+                message_obj = Message(message, data=data)
+                message_obj.state = MessageState.QUEUED
+                message_obj.scheduling_job_id = scheduling_job_id
+                message_obj.queue_time = timezone.utcnow()
+                message_objs.append(message_obj)
+            session.bulk_save_objects(message_objs, return_defaults=True)
+            for progress in latest_progress.values():
                 session.merge(progress)
-
-            message_obj = Message(message)
-            message_obj.state = MessageState.QUEUED
-            message_obj.scheduling_job_id = self.scheduling_job_id
-            message_obj.queue_time = timezone.utcnow()
-            session.add(message_obj)
             session.commit()
-            return IdentifiedMessage(serialized_message=message_obj.data, msg_id=message_obj.id)
+            return [IdentifiedMessage(serialized_message=message_obj.data, msg_id=message_obj.id,
+                                      deserialized_message=message)
+                    for (message, _, _), message_obj in zip(batch, message_objs)]
         except Exception as e:
             session.rollback()
             raise e
 
     def send_message(self, message):
+        """
+        Save the message to db and put it into the mailbox asynchronously.
+        Once the mailbox is closed, the message is saved to db before this method returns.
+        The message is serialized on the flusher thread and handed to the consumer as is, so it
+        must not be mutated after it is sent.
+        """
         if not self.scheduling_job_id:
             self.log.warning("scheduling_job_id not set, missing messages cannot be recovered.")
-        identified_message = self._save_message_to_db(message)
-        self.queue.put(identified_message)
+        self._add_length(1)
+        with self._close_lock:
+            if not self._closed:
+                self._pending.put((message, self.scheduling_job_id))
+                return
+        try:
+            identified_messages = self._save_messages_to_db(
+                [(message, serialize_message(message), self.scheduling_job_id)])
+        except Exception:
+            self._add_length(-1)
+            raise
+        self.queue.put(identified_messages[0])
+
+    def close(self, timeout: float = FLUSHER_CLOSE_TIMEOUT):
+        """
+        Save all the pending messages to db and stop the background flusher and prefetcher, waiting
+        at most timeout seconds for the flusher. Messages sent after the mailbox is closed are saved to db
+        synchronously, and identified messages are put into the mailbox without being prefetched.
+        """
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._pending.put(_CLOSE_FLUSHER)
+        self._flusher.join(timeout)
+        if self._flusher.is_alive():
+            self.log.error("Mailbox flusher did not finish in %s seconds, about %s pending messages "
+                           "may not be saved to db.", timeout, self._pending.qsize())
+        self._undecoded.put(_CLOSE_PREFETCHER)
 
     def send_identified_message(self, message: IdentifiedMessage):
+        self._add_length(1)
+        with self._close_lock:
+            if not self._closed:
+                self._undecoded.put(message)
+                return
         self.queue.put(message)
 
     def get_message(self):
         identified_message: IdentifiedMessage = self.queue.get()
+        self._add_length(-1)
         try:
-            return pickle.loads(identified_message.serialized_message)
+            return identified_message.deserialize()
         except Exception as e:
             self.log.error("Error occurred when load message from database, %s", e)
             return None
@@ -77,13 +222,15 @@ class Mailbox(LoggingMixin):
         return self.get_message_with_timeout(timeout=1)
 
     def length(self):
-        return self.queue.qsize()
+        return self._length
 
     def get_message_with_timeout(self, timeout=1):
         try:
-            return self.queue.get(timeout=timeout)
+            identified_message = self.queue.get(timeout=timeout)
         except Exception as e:
             return None
+        self._add_length(-1)
+        return identified_message
 
     def set_scheduling_job_id(self, scheduling_job_id):
         self.scheduling_job_id = scheduling_job_id
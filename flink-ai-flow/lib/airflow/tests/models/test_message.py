@@ -0,0 +1,78 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import pickle
+import unittest
+
+from notification_service.base_notification import BaseEvent
+
+from airflow.models.message import _DILL_PICKLED_TYPES, IdentifiedMessage, Message, serialize_message
+
+
+class TestMessage(unittest.TestCase):
+
+    def test_serialize_message(self):
+        event = BaseEvent(key='k', value='v', version=1, create_time=2)
+        message = Message(event)
+        self.assertEqual('BaseEvent', message.message_type)
+        self.assertEqual(event, pickle.loads(message.data))
+
+    def test_serialize_message_fallback(self):
+        self.addCleanup(_DILL_PICKLED_TYPES.clear)
+        serialized = serialize_message(lambda x: x + 1)
+        self.assertEqual(2, pickle.loads(serialized)(1))
+        self.assertNotIn(type(serialize_message), _DILL_PICKLED_TYPES)
+
+    def test_serialize_message_fallback_keeps_type_on_pickle(self):
+        self.addCleanup(_DILL_PICKLED_TYPES.clear)
+        event = BaseEvent(key='k', value=lambda x: x + 1)
+        self.assertEqual(2, pickle.loads(serialize_message(event)).value(1))
+        self.assertNotIn(BaseEvent, _DILL_PICKLED_TYPES)
+        event = BaseEvent(key='k', value='v')
+        self.assertEqual(pickle.dumps(event, protocol=pickle.HIGHEST_PROTOCOL), serialize_message(event))
+
+    def test_serialize_message_fallback_caches_local_type(self):
+        self.addCleanup(_DILL_PICKLED_TYPES.clear)
+
+        class LocalMessage(object):
+            def __init__(self, value):
+                self.value = value
+
+        self.assertEqual('v', pickle.loads(serialize_message(LocalMessage('v'))).value)
+        self.assertIn(LocalMessage, _DILL_PICKLED_TYPES)
+        self.assertEqual('w', pickle.loads(serialize_message(LocalMessage('w'))).value)
+
+    def test_message_with_serialized_data(self):
+        event = BaseEvent(key='k', value='v')
+        data = serialize_message(event)
+        message = Message(event, data=data)
+        self.assertIs(data, message.data)
+
+    def test_identified_message_deserialize(self):
+        event = BaseEvent(key='k', value='v')
+        self.assertIs(event, IdentifiedMessage(serialize_message(event), 1, event).deserialize())
+        identified_message = IdentifiedMessage(serialize_message(event), 1)
+        self.assertEqual(event, identified_message.deserialize())
+        self.assertIs(identified_message.deserialize(), identified_message.deserialize())
+
+    def test_identified_message_deserialize_failure(self):
+        identified_message = IdentifiedMessage(b'not a pickle', 1)
+        with self.assertRaises(Exception) as context:
+            identified_message.deserialize()
+        with self.assertRaises(Exception) as again:
+            identified_message.deserialize()
+        self.assertIs(context.exception, again.exception)
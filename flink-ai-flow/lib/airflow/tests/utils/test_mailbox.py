@@ -15,23 +15,36 @@
 # specific language governing permissions and limitations
 # under the License.
 #
+import threading
 import unittest
+from unittest import mock
 
 from notification_service.base_notification import BaseEvent
 
 from airflow.models.event_progress import get_event_progress
+from airflow.models.message import IdentifiedMessage, Message, MessageState, serialize_message
 from airflow.utils.mailbox import Mailbox
 from airflow.events.scheduler_events import StopDagEvent, SchedulerInnerEventUtil
+from airflow.utils.session import create_session
 from tests.test_utils import db
 
 
 class TestMailbox(unittest.TestCase):
 
+    def setUp(self) -> None:
+        db.clear_db_message()
+
     def tearDown(self) -> None:
         db.clear_db_event_progress()
+        db.clear_db_message()
 
-    def test_send_inner_event(self):
+    def _create_mailbox(self):
         mailbox = Mailbox()
+        self.addCleanup(mailbox.close)
+        return mailbox
+
+    def test_send_inner_event(self):
+        mailbox = self._create_mailbox()
         mailbox.scheduling_job_id = 1
         mailbox.send_message(StopDagEvent.to_base_event(StopDagEvent('q')))
         message = mailbox.get_identified_message()
@@ -42,7 +55,7 @@ class TestMailbox(unittest.TestCase):
         self.assertIsNone(progress)
 
     def test_send_event(self):
-        mailbox = Mailbox()
+        mailbox = self._create_mailbox()
         mailbox.scheduling_job_id = 1
         event = BaseEvent(key='1', value='1', version=1, create_time=2)
         mailbox.send_message(event)
@@ -56,10 +69,116 @@ class TestMailbox(unittest.TestCase):
 
         event = BaseEvent(key='1', value='1', version=2, create_time=3)
         mailbox.send_message(event)
+        mailbox.get_identified_message()
         progress = get_event_progress(1)
         self.assertEqual(3, progress.last_event_time)
         self.assertEqual(2, progress.last_event_version)
 
+    def test_send_messages_in_order(self):
+        mailbox = self._create_mailbox()
+        mailbox.scheduling_job_id = 1
+        for i in range(300):
+            mailbox.send_message(BaseEvent(key='k', value=str(i), version=i, create_time=i))
+        self.assertEqual(300, mailbox.length())
+        messages = [mailbox.get_identified_message() for _ in range(300)]
+        self.assertEqual([str(i) for i in range(300)], [m.deserialize().value for m in messages])
+        self.assertEqual(300, len({m.msg_id for m in messages}))
+        self.assertEqual(0, mailbox.length())
+        progress = get_event_progress(1)
+        self.assertEqual(299, progress.last_event_time)
+        self.assertEqual(299, progress.last_event_version)
+
+    def test_save_messages_keeps_latest_progress(self):
+        mailbox = self._create_mailbox()
+        mailbox._save_messages_to_db([
+            (event, serialize_message(event), 1) for event in [
+                BaseEvent(key='k', value='v', version=2, create_time=3),
+                BaseEvent(key='k', value='v', version=5, create_time=6),
+                BaseEvent(key='k', value='v', version=1, create_time=2),
+            ]
+        ])
+        progress = get_event_progress(1)
+        self.assertEqual(6, progress.last_event_time)
+        self.assertEqual(5, progress.last_event_version)
+
+    def test_send_identified_message(self):
+        mailbox = self._create_mailbox()
+        event = BaseEvent(key='k', value='v')
+        mailbox.send_identified_message(IdentifiedMessage(serialize_message(event), 1))
+        message = mailbox.get_identified_message()
+        self.assertIsNotNone(message._decoded)
+        self.assertEqual(event, message.deserialize())
+        self.assertEqual(0, mailbox.length())
+
+    @staticmethod
+    def _queued_message_values(scheduling_job_id):
+        with create_session() as session:
+            messages = session.query(Message).filter(Message.scheduling_job_id == scheduling_job_id,
+                                                     Message.state == MessageState.QUEUED) \
+                .order_by(Message.id).all()
+            return [IdentifiedMessage(m.data, m.id).deserialize().value for m in messages]
+
+    def test_close_saves_pending_messages(self):
+        mailbox = self._create_mailbox()
+        mailbox.scheduling_job_id = 1
+        for i in range(10):
+            mailbox.send_message(BaseEvent(key='k', value=str(i)))
+        mailbox.close()
+        self.assertEqual([str(i) for i in range(10)], self._queued_message_values(1))
+
+        mailbox.send_message(BaseEvent(key='k', value='10'))
+        self.assertEqual([str(i) for i in range(11)], self._queued_message_values(1))
+        self.assertEqual(11, mailbox.length())
+
+    def test_close_stops_background_threads(self):
+        mailbox = self._create_mailbox()
+        mailbox.close()
+        mailbox._prefetcher.join(5)
+        self.assertFalse(mailbox._flusher.is_alive())
+        self.assertFalse(mailbox._prefetcher.is_alive())
+
+        event = BaseEvent(key='k', value='v')
+        mailbox.send_identified_message(IdentifiedMessage(serialize_message(event), 1))
+        self.assertEqual(event, mailbox.get_message())
+        self.assertEqual(0, mailbox.length())
+
+    def test_close_does_not_wait_for_hung_flusher(self):
+        mailbox = self._create_mailbox()
+        mailbox.scheduling_job_id = 1
+        saving = threading.Event()
+        release = threading.Event()
+
+        def hung_save(batch):
+            saving.set()
+            release.wait()
+            return []
+
+        with mock.patch.object(mailbox, '_save_messages_to_db', side_effect=hung_save):
+            mailbox.send_message(BaseEvent(key='k', value='0'))
+            self.assertTrue(saving.wait(5))
+            with mock.patch.object(mailbox.log, 'error') as log_error:
+                mailbox.close(timeout=0.1)
+            log_error.assert_called_once()
+            release.set()
+            mailbox._flusher.join(5)
+        self.assertFalse(mailbox._flusher.is_alive())
+
+    def test_failed_batch_is_saved_one_by_one(self):
+        mailbox = self._create_mailbox()
+        mailbox.scheduling_job_id = 1
+        save_messages_to_db = mailbox._save_messages_to_db
+
+        def save_single_message(batch):
+            if len(batch) > 1:
+                raise Exception('batch failed')
+            return save_messages_to_db(batch)
+
+        with mock.patch.object(mailbox, '_save_messages_to_db', side_effect=save_single_message):
+            mailbox._flush([(event, serialize_message(event), 1) for event in
+                            [BaseEvent(key='k', value='0'), BaseEvent(key='k', value='1')]])
+        self.assertEqual(['0', '1'], self._queued_message_values(1))
+        self.assertEqual(['0', '1'], [mailbox.get_message().value for _ in range(2)])
+
 
 if __name__ == '__main__':
     unittest.main()
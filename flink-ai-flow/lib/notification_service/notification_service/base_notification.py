@@ -24,6 +24,10 @@ from typing import List, Union, Tuple
 UNDEFINED_EVENT_TYPE = "UNDEFINED"
 ANY_CONDITION = "*"
 DEFAULT_NAMESPACE = "default"
+# The attributes set by BaseEvent.__init__, in the order of its arguments.
+_BASE_EVENT_FIELDS = ('key', 'value', 'event_type', 'version', 'create_time',
+                      'context', 'namespace', 'sender')
+_BASE_EVENT_FIELD_SET = frozenset(_BASE_EVENT_FIELDS)
 
 
 class BaseEvent(object):
@@ -45,6 +49,13 @@ class BaseEvent(object):
         self.namespace = namespace
         self.sender = sender
 
+    def __reduce_ex__(self, protocol):
+        # Pickle plain events as constructor arguments, which is cheaper than saving and restoring
+        # the instance dict. Subclasses and events with extra attributes use the default reduction.
+        if type(self) is not BaseEvent or self.__dict__.keys() != _BASE_EVENT_FIELD_SET:
+            return super().__reduce_ex__(protocol)
+        return BaseEvent, tuple(getattr(self, name) for name in _BASE_EVENT_FIELDS)
+
     def __str__(self) -> str:
         return 'key:{0}, value:{1}, type:{2}, version:{3}, create_time:{4}, ' \
                'context: {5}, namespace: {6}, sender: {7}' \
@@ -0,0 +1,45 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+#
+import pickle
+import unittest
+
+from notification_service.base_notification import BaseEvent
+
+
+class TestBaseEvent(unittest.TestCase):
+
+    def test_pickle_event(self):
+        event = BaseEvent(key='k', value='v', event_type='t', version=1, create_time=2,
+                          context='c', namespace='n', sender='s')
+        self.assertEqual(event, pickle.loads(pickle.dumps(event, protocol=pickle.HIGHEST_PROTOCOL)))
+
+    def test_pickle_event_with_extra_attribute(self):
+        event = BaseEvent(key='k', value='v')
+        event.extra = 'e'
+        loaded_event = pickle.loads(pickle.dumps(event, protocol=pickle.HIGHEST_PROTOCOL))
+        self.assertEqual(event, loaded_event)
+        self.assertEqual('e', loaded_event.extra)
+
+    def test_pickle_event_with_replaced_attribute(self):
+        event = BaseEvent(key='k', value='v', sender='s')
+        del event.sender
+        event.extra = 'e'
+        loaded_event = pickle.loads(pickle.dumps(event, protocol=pickle.HIGHEST_PROTOCOL))
+        self.assertEqual('e', loaded_event.extra)
+        self.assertFalse(hasattr(loaded_event, 'sender'))